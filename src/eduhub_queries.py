@@ -1,7 +1,89 @@
-from pymongo import MongoClient
+from bson import Regex
+from pymongo import IndexModel, MongoClient, ReturnDocument, UpdateOne
+import functools
 import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    from msglc import dump as msglc_dump
+    from msglc.reader import LazyReader
+except ImportError:
+    msglc_dump = None
+    LazyReader = None
+
 from helper import Helper
-from pymongo.errors import DuplicateKeyError, WriteError
+from pymongo.errors import CollectionInvalid, DuplicateKeyError, WriteError
+from pymongo.write_concern import WriteConcern
+
+log = logging.getLogger(__name__)
+
+# Keep each insert_many message comfortably under the 16MB BSON message cap
+SEED_BATCH_SIZE = 1000
+
+ONE_MONTH = timedelta(days=30)
+
+# Cap on the number of IDs sent in a single $in query document
+IN_QUERY_BATCH_SIZE = 1000
+
+# Below this many documents the per-document date parser is cheaper than
+# staging a DataFrame
+PANDAS_SEED_THRESHOLD = 500
+
+# Lean course shape returned by the list-style queries; callers that need
+# the full document (description, tags, ...) pass their own projection
+_COURSE_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "courseId": 1,
+    "title": 1,
+    "category": 1,
+    "level": 1,
+    "price": 1,
+    "rating": 1,
+    "isPublished": 1,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _title_pattern(title, prefix):
+    """Escaped, case-insensitive BSON regex for a title, cached per search term."""
+    pattern = re.escape(title)
+    if prefix:
+        pattern = f"^{pattern}"
+    return Regex(pattern, "i")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(url):
+    """Create one MongoClient per URL so instances share the connection pool."""
+    return MongoClient(url, maxPoolSize=50)
+
+
+def _load_json(path):
+    """Parse a JSON file, using orjson's C decoder when it is available."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
 
 
 class EdHubDB:
@@ -12,15 +94,21 @@ class EdHubDB:
         # File paths
         self.schemas_path = "../data/schema_validation.json"
         self.sample_data_path = "../data/sample_data.json"
+        self.msg_sample_data_path = "../data/sample_data.msg"
+
+        # Parsed schemas and their date-field paths, filled on first load_schemas()
+        self._schemas = None
+        self._date_paths = None
 
         self.connection_url = "mongodb://localhost:27017/"
         self.database_name = "eduhub_db"
-        self.client = MongoClient(self.connection_url)
+        self.client = _get_client(self.connection_url)
         self.db = self.client[self.database_name]
-
-        # drop existing collections to start afresh
-        for collection in self.db.list_collection_names():
-            self.db[collection].drop()
+        # Seed writes skip the journal ack; runtime CRUD keeps the default
+        # write concern (w=0 would also forbid bypassing validation)
+        self._seed_db = self.client.get_database(
+            self.database_name, write_concern=WriteConcern(w=1, j=False)
+        )
 
         # collections
         self.users_col = self.db["users"]
@@ -29,53 +117,184 @@ class EdHubDB:
         self.lessons_col = self.db["lessons"]
         self.assignments_col = self.db["assignments"]
         self.submissions_col = self.db["submissions"]
+        self.counters_col = self.db["counters"]
+
+    def reset(self):
+        """Drop the whole database to start afresh (previously done in __init__).
+
+        A single dropDatabase command replaces the old
+        listCollections-then-drop loop, which paid one round trip per
+        collection.
+        """
+        self.client.drop_database(self.database_name)
 
     # Part 1
 
     def build_collection(self):
-        """Setup collections and validations from JSON files"""
+        """Setup collections and validations from JSON files
+
+        Creation is idempotent (existing collections are left alone) and
+        runs concurrently since PyMongo releases the GIL on network I/O.
+        """
 
         schemas = self.load_schemas()
 
-        try:
-            for collection_name, validator in schemas.items():
+        def create(item):
+            collection_name, validator = item
+            try:
                 self.db.create_collection(collection_name, validator=validator)
-                print(f"Created collection: {collection_name}")
-        except Exception as e:
-            print(f"Error initializing database: {e}")
+                log.info("Created collection: %s", collection_name)
+            except CollectionInvalid:
+                # Collection already exists
+                pass
+
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(create, schemas.items()))
+        except Exception:
+            log.exception("Error initializing database")
             raise
 
+        # Indexes are part of the collection lifecycle: the hinted queries
+        # below depend on them existing before the first read
+        self.setup_index()
+
     # Part 2
-    def seed_database(self):
-        """Seed all collections with sample data, converting date fields using schema."""
+    def export_sample_data_msg(self):
+        """One-time dev step: write the JSON fixture as a msgpack lazy-load file."""
+        if msglc_dump is None:
+            raise RuntimeError("msglc is not installed")
+        msglc_dump(self.msg_sample_data_path, _load_json(self.sample_data_path))
+
+    def _iter_sample_data(self, only=None):
+        """Yield (collection_name, documents) pairs from the sample fixture.
+
+        When the msgpack fixture from export_sample_data_msg exists, only
+        the requested collections are decoded; otherwise the whole JSON
+        fixture is parsed as before.
+        """
+        if LazyReader is not None and os.path.exists(self.msg_sample_data_path):
+            reader = LazyReader(self.msg_sample_data_path)
+            for name in only if only is not None else self.load_schemas():
+                # LazyReader hands back lazy container wrappers; coerce to
+                # a real list so the seeding guard and batching see one
+                yield name, list(reader[name])
+            return
+        if ijson is not None:
+            # Stream top-level keys so only one collection's documents are
+            # in memory at a time. use_float keeps JSON numbers as floats;
+            # ijson's default Decimal cannot be BSON-encoded
+            with open(self.sample_data_path, "rb") as f:
+                for name, documents in ijson.kvitems(f, "", use_float=True):
+                    if only is None or name in only:
+                        yield name, documents
+            return
+        data = _load_json(self.sample_data_path)
+        for name, documents in data.items():
+            if only is None or name in only:
+                yield name, documents
+
+    def seed_database(self, only=None):
+        """Seed collections with sample data, converting date fields using schema.
+
+        Pass only=["users", ...] to reseed a subset of collections without
+        paying to parse the rest of the fixture.
+        """
         try:
-            with open(self.sample_data_path, "r") as f:
-                data = json.load(f)
-            with open(self.schemas_path, "r") as f:
-                schemas = json.load(f)
+            schemas = self.load_schemas()
+            for collection_name, documents in self._iter_sample_data(only):
+                self._seed_collection(collection_name, documents, schemas)
         except FileNotFoundError as e:
             raise FileNotFoundError(str(e))
-        except json.JSONDecodeError as e:
+        except ValueError as e:
+            # orjson.JSONDecodeError and json.JSONDecodeError both subclass ValueError
             raise ValueError(str(e))
 
-        for collection_name, documents in data.items():
-            if isinstance(documents, list) and collection_name in schemas:
-                date_fields = self.helper.get_date_fields(
-                    schemas[collection_name]["$jsonSchema"]
-                )
-                documents = [
-                    self.helper.convert_dates_by_schema(doc, date_fields)
-                    for doc in documents
-                ]
-                if documents:
-                    self.db[collection_name].insert_many(documents)
-                    print(
-                        f"Seeded {len(documents)} documents into '{collection_name}' collection."
-                    )
-            else:
-                print(
-                    f"Warning: Data for '{collection_name}' is not a list or schema missing, skipping."
+    def _seed_collection(self, collection_name, documents, schemas):
+        """Convert and insert one collection's documents in bounded batches."""
+        if not isinstance(documents, list) or collection_name not in schemas:
+            log.warning(
+                "Data for '%s' is not a list or schema missing, skipping.",
+                collection_name,
+            )
+            return
+        # Reseeding is idempotent: clear the previous fixture contents so
+        # re-running the notebook neither duplicates documents nor trips
+        # the unique indexes
+        self._seed_db[collection_name].delete_many({})
+        date_paths = self._date_paths[collection_name]
+        if (
+            pd is not None
+            and len(documents) > PANDAS_SEED_THRESHOLD
+            and any(len(path) == 1 for path in date_paths)
+        ):
+            date_paths = self._convert_dates_vectorized(documents, date_paths)
+        total = 0
+        batch = []
+        for doc in documents:
+            # Convert in place; no need to build a second list of documents
+            if date_paths:
+                self.helper.convert_dates_by_paths(doc, date_paths)
+            batch.append(doc)
+            if len(batch) >= SEED_BATCH_SIZE:
+                # Unordered writes let the server parallelize the batch
+                # instead of stopping at the first failure; the fixture
+                # was generated from these schemas, so skip revalidation
+                self._seed_db[collection_name].insert_many(
+                    batch, ordered=False, bypass_document_validation=True
                 )
+                total += len(batch)
+                batch = []
+        if batch:
+            self._seed_db[collection_name].insert_many(
+                batch, ordered=False, bypass_document_validation=True
+            )
+            total += len(batch)
+        if total:
+            log.info(
+                "Seeded %d documents into '%s' collection.", total, collection_name
+            )
+            if collection_name == "enrollments":
+                self._sync_enrollment_counter()
+
+    def _sync_enrollment_counter(self):
+        """Advance the enrollments counter past every seeded enrollmentId.
+
+        Without this, next_sequence would start back at "e1" after a seed
+        and collide with the fixture's IDs.
+        """
+        max_seq = 0
+        for doc in self.enrollments_col.find({}, {"_id": 0, "enrollmentId": 1}):
+            enrollment_id = doc.get("enrollmentId") or ""
+            if enrollment_id[:1] == "e" and enrollment_id[1:].isdigit():
+                max_seq = max(max_seq, int(enrollment_id[1:]))
+        if max_seq:
+            self.counters_col.update_one(
+                {"_id": "enrollments"}, {"$max": {"seq": max_seq}}, upsert=True
+            )
+
+    def _convert_dates_vectorized(self, documents, date_paths):
+        """Parse top-level date columns with pandas in one vectorized pass.
+
+        Only successfully parsed values are written back into the original
+        dicts, so non-uniform documents keep their exact shape. Returns
+        all the paths: the per-document converter only touches values that
+        are still strings, so it cheaply picks up anything this pass could
+        not parse (e.g. older pandas without ISO8601 format support).
+        """
+        top_level = [path[0] for path in date_paths if len(path) == 1]
+        for field in top_level:
+            parsed = pd.to_datetime(
+                pd.Series([doc.get(field) for doc in documents]),
+                format="ISO8601",
+                utc=True,
+                cache=True,
+                errors="coerce",
+            ).dt.to_pydatetime()
+            for doc, value in zip(documents, parsed):
+                if isinstance(doc.get(field), str) and pd.notna(value):
+                    doc[field] = value
+        return date_paths
 
     ## Part 3 Basic CRUD operations
     def insert_student(self, data):
@@ -85,8 +304,8 @@ class EdHubDB:
             data["role"] = "student"
             result = self.users_col.insert_one(data)
             return result
-        except Exception as e:
-            print(f"Unexpected error inserting student: {e}")
+        except Exception:
+            log.exception("Unexpected error inserting student")
         return None
 
     def insert_course(self, data):
@@ -94,14 +313,24 @@ class EdHubDB:
         try:
             result = self.courses_col.insert_one(data)
             return result.inserted_id
-        except Exception as e:
-            print(f"Unexpected error inserting course: {e}")
+        except Exception:
+            log.exception("Unexpected error inserting course")
         return None
 
+    def next_sequence(self, name):
+        """Atomically allocate the next value of a named counter."""
+        counter = self.counters_col.find_one_and_update(
+            {"_id": name},
+            {"$inc": {"seq": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return counter["seq"]
+
     def register_student(self, student_id, course_id):
         """Register a student to a course (create an enrollment)."""
         enrollment = {
-            "enrollmentId": f"e{self.enrollments_col.count_documents({}) + 1}",
+            "enrollmentId": f"e{self.next_sequence('enrollments')}",
             "studentId": student_id,
             "courseId": course_id,
             "enrollmentDate": self.helper.faker.date_time(),
@@ -112,32 +341,111 @@ class EdHubDB:
         try:
             result = self.enrollments_col.insert_one(enrollment)
             return result.inserted_id
-        except Exception as e:
-            print(f"Unexpected error registering student: {e}")
+        except Exception:
+            log.exception("Unexpected error registering student")
         return None
 
+    def register_students_bulk(self, pairs):
+        """Register many (student_id, course_id) pairs in two round trips.
+
+        A single counter update reserves a whole block of enrollment IDs,
+        then one unordered insert_many writes all the enrollments, instead
+        of one counter bump plus one insert per registration.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        counter = self.counters_col.find_one_and_update(
+            {"_id": "enrollments"},
+            {"$inc": {"seq": len(pairs)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        first = counter["seq"] - len(pairs) + 1
+        now = datetime.now(timezone.utc)
+        enrollments = [
+            {
+                "enrollmentId": f"e{first + i}",
+                "studentId": student_id,
+                "courseId": course_id,
+                "enrollmentDate": now,
+                "progress": 0.0,
+                "completed": False,
+                "certificateIssued": False,
+            }
+            for i, (student_id, course_id) in enumerate(pairs)
+        ]
+        try:
+            result = self.enrollments_col.insert_many(enrollments, ordered=False)
+            return result.inserted_ids
+        except Exception:
+            log.exception("Unexpected error bulk-registering students")
+        return []
+
     def insert_lesson(self, data):
         """Add a lesson to a course (insert into lessons collection)."""
         try:
             result = self.lessons_col.insert_one(data)
             return result
-        except Exception as e:
-            print(f"Unexpected error adding lesson: {e}")
+        except Exception:
+            log.exception("Unexpected error adding lesson")
         return None
 
-    def get_active_students(self):
+    def get_active_students(self, projection=None):
         """Find all active students"""
+        if projection is None:
+            projection = {
+                "_id": 0,
+                "userId": 1,
+                "email": 1,
+                "firstName": 1,
+                "lastName": 1,
+                "role": 1,
+                "isActive": 1,
+            }
         try:
-            students = list(self.users_col.find({"role": "student", "isActive": True}))
+            students = list(
+                self.users_col.find(
+                    {"role": "student", "isActive": True}, projection=projection
+                )
+                .hint([("isActive", 1), ("role", 1)])
+                .batch_size(1000)
+            )
             return students
-        except Exception as e:
-            print(f"Error fetching active students: {e}")
+        except Exception:
+            log.exception("Error fetching active students")
             return []
 
-    def get_course_details(self):
-        """Retrieve course details with instructor information"""
+    def iter_active_students(self, projection=None):
+        """Stream active students in batches instead of materializing a list.
+
+        Prefer this over get_active_students for large result sets: peak
+        memory stays at one cursor batch instead of the whole result.
+        """
+        yield from self.users_col.find(
+            {"role": "student", "isActive": True}, projection=projection
+        ).batch_size(500)
+
+    def iter_courses_by_category(self, category, projection=None):
+        """Stream courses in a category without materializing the list."""
+        if projection is None:
+            projection = _COURSE_SUMMARY_PROJECTION
+        yield from self.courses_col.find(
+            {"category": category}, projection=projection
+        ).batch_size(500)
+
+    def get_course_details(self, match=None):
+        """Retrieve course details with instructor information
+
+        An optional match filter on course fields is applied before the
+        $lookup so only matching courses are joined against users.
+        """
         try:
-            pipeline = [
+            pipeline = [{"$match": match}] if match else []
+            pipeline += [
+                # Shed the heavy fields before the join so only lean
+                # course documents flow through the $lookup stage
+                {"$project": {"description": 0, "tags": 0}},
                 {
                     "$lookup": {
                         "from": "users",
@@ -147,42 +455,117 @@ class EdHubDB:
                     }
                 },
                 {"$unwind": "$instructor"},
+                # Keep the instructor's identity and profile bio/skills
+                # (displayed by the notebook) but drop account fields
+                {
+                    "$project": {
+                        "instructor._id": 0,
+                        "instructor.profile.avatar": 0,
+                        "instructor.dateJoined": 0,
+                        "instructor.isActive": 0,
+                    }
+                },
             ]
             courses = list(self.courses_col.aggregate(pipeline))
             return courses
-        except Exception as e:
-            print(f"Error fetching course details: {e}")
+        except Exception:
+            log.exception("Error fetching course details")
             return []
 
-    def get_courses_by_category(self, category):
+    def get_courses_by_category(self, category, projection=None):
         """Get all courses in a specific category"""
+        if projection is None:
+            projection = _COURSE_SUMMARY_PROJECTION
         try:
-            courses = list(self.courses_col.find({"category": category}))
+            courses = list(
+                self.courses_col.find({"category": category}, projection=projection)
+                .hint([("category", 1)])
+                .batch_size(1000)
+            )
             return courses
-        except Exception as e:
-            print(f"Error fetching courses by category: {e}")
+        except Exception:
+            log.exception("Error fetching courses by category")
             return []
 
+    @staticmethod
+    def _roster_pipeline(course_id):
+        return [
+            {"$match": {"courseId": course_id}},
+            {
+                "$lookup": {
+                    "from": "users",
+                    "localField": "studentId",
+                    "foreignField": "userId",
+                    "as": "student",
+                }
+            },
+            {"$unwind": "$student"},
+            {"$replaceRoot": {"newRoot": "$student"}},
+        ]
+
     def get_student_enrolled_to_course(self, course_id):
         """Find students enrolled in a particular course"""
         try:
-            enrollments = self.enrollments_col.find({"courseId": course_id})
-            student_ids = [enr["studentId"] for enr in enrollments]
-            students = list(self.users_col.find({"userId": {"$in": student_ids}}))
+            students = list(
+                self.enrollments_col.aggregate(
+                    self._roster_pipeline(course_id), hint=[("courseId", 1)]
+                )
+            )
             return students
-        except Exception as e:
-            print(f"Error fetching students enrolled to course: {e}")
+        except Exception:
+            log.exception("Error fetching students enrolled to course")
             return []
 
-    def search_courses_by_title(self, title):
-        """Search courses by title (case-insensitive, partial match)"""
-        try:
-            courses = list(
-                self.courses_col.find({"title": {"$regex": title, "$options": "i"}})
+    def iter_student_enrolled_to_course(self, course_id):
+        """Stream a course roster straight off the aggregation cursor."""
+        yield from self.enrollments_col.aggregate(
+            self._roster_pipeline(course_id), hint=[("courseId", 1)], batchSize=500
+        )
+
+    def iter_students_by_ids(self, student_ids, projection=None):
+        """Stream user documents for a list of userIds, chunking the $in query.
+
+        Prefer get_student_enrolled_to_course's server-side join; this is
+        for callers that already hold an ID list. Batching keeps the query
+        document small so the planner never sees a huge $in array.
+        """
+        student_ids = list(student_ids)
+        for start in range(0, len(student_ids), IN_QUERY_BATCH_SIZE):
+            chunk = student_ids[start : start + IN_QUERY_BATCH_SIZE]
+            yield from self.users_col.find(
+                {"userId": {"$in": chunk}}, projection=projection
             )
+
+    def search_courses_by_title(self, title, prefix=True):
+        """Search courses by title (case-insensitive)
+
+        With prefix=True (default) the escaped pattern is anchored so the
+        case-insensitive collation index on title can back the query.
+        With prefix=False the query runs against the text index on
+        title/description and sorts by relevance, instead of the old
+        unanchored regex that scanned the whole collection.
+        """
+        try:
+            if prefix:
+                courses = list(
+                    self.courses_col.find(
+                        {"title": _title_pattern(title, prefix=True)},
+                        projection=_COURSE_SUMMARY_PROJECTION,
+                    ).collation({"locale": "en", "strength": 2})
+                )
+            else:
+                courses = list(
+                    self.courses_col.find(
+                        {"$text": {"$search": title}},
+                        projection={
+                            **_COURSE_SUMMARY_PROJECTION,
+                            "score": {"$meta": "textScore"},
+                        },
+                    ).sort([("score", {"$meta": "textScore"})])
+                )
             return courses
-        except Exception as e:
-            print(f"Error searching courses by title: {e}")
+        except Exception:
+            log.exception("Error searching courses by title")
             return []
 
     def modify_profile(self, user_id, updates):
@@ -192,25 +575,30 @@ class EdHubDB:
                 {"userId": user_id}, {"$set": {"profile": updates}}
             )
             if result.matched_count == 0:
-                print(f"No user found with userId: {user_id}")
+                log.warning("No user found with userId: %s", user_id)
                 return False
             return True
-        except Exception as e:
-            print(f"Error updating profile: {e}")
+        except Exception:
+            log.exception("Error updating profile")
             return False
 
     def publish_course(self, course_id):
-        """Mark a course as published"""
+        """Mark a course as published (skips the write if already published)"""
         try:
             result = self.courses_col.update_one(
-                {"courseId": course_id}, {"$set": {"isPublished": True}}
+                {"courseId": course_id, "isPublished": {"$ne": True}},
+                {"$set": {"isPublished": True}},
             )
             if result.matched_count == 0:
-                print(f"No course found with courseId: {course_id}")
+                # No match means missing or already published; only check
+                # existence on this cold path
+                if self.courses_col.find_one({"courseId": course_id}, {"_id": 1}):
+                    return True
+                log.warning("No course found with courseId: %s", course_id)
                 return False
             return True
-        except Exception as e:
-            print(f"Error publishing course: {e}")
+        except Exception:
+            log.exception("Error publishing course")
             return False
 
     def update_assignment_grade(self, submission_id, grade, feedback=None):
@@ -223,13 +611,69 @@ class EdHubDB:
                 {"submissionId": submission_id}, {"$set": update_fields}
             )
             if result.matched_count == 0:
-                print(f"No submission found with submissionId: {submission_id}")
+                log.warning("No submission found with submissionId: %s", submission_id)
                 return False
             return True
-        except Exception as e:
-            print(f"Error updating assignment grade: {e}")
+        except Exception:
+            log.exception("Error updating assignment grade")
             return False
 
+    def update_grades_bulk(self, items):
+        """Grade many submissions in one round trip.
+
+        items is an iterable of (submission_id, grade, feedback) tuples;
+        feedback may be None to leave the existing feedback untouched.
+        """
+        ops = []
+        for submission_id, grade, feedback in items:
+            update_fields = {"grade": grade}
+            if feedback is not None:
+                update_fields["feedback"] = feedback
+            ops.append(
+                UpdateOne({"submissionId": submission_id}, {"$set": update_fields})
+            )
+        if not ops:
+            return 0
+        try:
+            result = self.submissions_col.bulk_write(ops, ordered=False)
+            return result.modified_count
+        except Exception:
+            log.exception("Error bulk-updating grades")
+            return 0
+
+    def publish_courses_bulk(self, course_ids):
+        """Mark many courses as published in one round trip."""
+        ops = [
+            UpdateOne({"courseId": course_id}, {"$set": {"isPublished": True}})
+            for course_id in course_ids
+        ]
+        if not ops:
+            return 0
+        try:
+            result = self.courses_col.bulk_write(ops, ordered=False)
+            return result.modified_count
+        except Exception:
+            log.exception("Error bulk-publishing courses")
+            return 0
+
+    def add_tags_to_course_bulk(self, items):
+        """Add tags to many courses in one round trip.
+
+        items is an iterable of (course_id, tags) tuples.
+        """
+        ops = [
+            UpdateOne({"courseId": course_id}, {"$addToSet": {"tags": {"$each": tags}}})
+            for course_id, tags in items
+        ]
+        if not ops:
+            return 0
+        try:
+            result = self.courses_col.bulk_write(ops, ordered=False)
+            return result.modified_count
+        except Exception:
+            log.exception("Error bulk-adding tags to courses")
+            return 0
+
     def add_tags_to_course(self, course_id, tags):
         """Add tags to an existing course"""
         try:
@@ -237,37 +681,52 @@ class EdHubDB:
                 {"courseId": course_id}, {"$addToSet": {"tags": {"$each": tags}}}
             )
             if result.matched_count == 0:
-                print(f"No course found with courseId: {course_id}")
+                log.warning("No course found with courseId: %s", course_id)
                 return False
             return True
-        except Exception as e:
-            print(f"Error adding tags to course: {e}")
+        except Exception:
+            log.exception("Error adding tags to course")
             return False
 
     def deactivate_user(self, user_id):
-        """Remove a user (soft delete by setting isActive to false)"""
+        """Remove a user (soft delete, skipping the write if already inactive)"""
         try:
             result = self.users_col.update_one(
-                {"userId": user_id}, {"$set": {"isActive": False}}
+                {"userId": user_id, "isActive": {"$ne": False}},
+                {"$set": {"isActive": False}},
             )
             if result.matched_count == 0:
-                print(f"No user found with userId: {user_id}")
+                if self.users_col.find_one({"userId": user_id}, {"_id": 1}):
+                    return True
+                log.warning("No user found with userId: %s", user_id)
                 return False
             return True
-        except Exception as e:
-            print(f"Error deactivating user: {e}")
+        except Exception:
+            log.exception("Error deactivating user")
             return False
 
+    def deactivate_users(self, user_ids):
+        """Soft-delete many users with a single update_many."""
+        try:
+            result = self.users_col.update_many(
+                {"userId": {"$in": list(user_ids)}, "isActive": {"$ne": False}},
+                {"$set": {"isActive": False}},
+            )
+            return result.modified_count
+        except Exception:
+            log.exception("Error bulk-deactivating users")
+            return 0
+
     def delete_enrollment(self, enrollment_id):
         """Delete an enrollment"""
         try:
             result = self.enrollments_col.delete_one({"enrollmentId": enrollment_id})
             if result.deleted_count == 0:
-                print(f"No enrollment found with enrollmentId: {enrollment_id}")
+                log.warning("No enrollment found with enrollmentId: %s", enrollment_id)
                 return False
             return True
-        except Exception as e:
-            print(f"Error deleting enrollment: {e}")
+        except Exception:
+            log.exception("Error deleting enrollment")
             return False
 
     def remove_lesson_from_course(self, lesson_id, course_id):
@@ -278,61 +737,101 @@ class EdHubDB:
                 {"$set": {"courseId": ""}},
             )
             if result.matched_count == 0:
-                print(
-                    f"No lesson found with lessonId: {lesson_id} in courseId: {course_id}"
+                log.warning(
+                    "No lesson found with lessonId: %s in courseId: %s",
+                    lesson_id,
+                    course_id,
                 )
                 return False
             return True
-        except Exception as e:
-            print(f"Error removing lesson from course: {e}")
+        except Exception:
+            log.exception("Error removing lesson from course")
             return False
 
     # Part 4: Advanced Queries and Aggregation
-    def courses_by_price(self, min_price, max_price):
+    def courses_by_price(self, min_price, max_price, projection=None):
         """Price range query"""
+        if projection is None:
+            projection = _COURSE_SUMMARY_PROJECTION
         try:
             courses = list(
-                self.courses_col.find({"price": {"$gte": min_price, "$lte": max_price}})
+                self.courses_col.find(
+                    {"price": {"$gte": min_price, "$lte": max_price}},
+                    projection=projection,
+                )
+                .hint([("price", 1)])
+                .batch_size(1000)
             )
             return courses
-        except Exception as e:
-            print(f"Error fetching courses by price: {e}")
+        except Exception:
+            log.exception("Error fetching courses by price")
             return []
 
     def recent_signups(self, months=6):
         """New users in timeframe - past number of months"""
-        from datetime import datetime, timedelta
-
         try:
-            cutoff = datetime.utcnow() - timedelta(days=30 * months)
-            users = list(self.users_col.find({"dateJoined": {"$gte": cutoff}}))
+            cutoff = datetime.now(timezone.utc) - months * ONE_MONTH
+            users = list(
+                self.users_col.find(
+                    {"dateJoined": {"$gte": cutoff}},
+                    # The notebook flattens profile (bio/avatar/skills)
+                    # and shows isActive, so keep both in the result
+                    projection={
+                        "_id": 0,
+                        "userId": 1,
+                        "email": 1,
+                        "firstName": 1,
+                        "lastName": 1,
+                        "role": 1,
+                        "dateJoined": 1,
+                        "profile": 1,
+                        "isActive": 1,
+                    },
+                )
+            )
             return users
-        except Exception as e:
-            print(f"Error fetching recent signups: {e}")
+        except Exception:
+            log.exception("Error fetching recent signups")
             return []
 
-    def courses_with_keyword(self, keywords):
+    def courses_with_keyword(self, keywords, projection=None):
         """Find courses that have specific tags using $in operator"""
+        if projection is None:
+            # A tag query's callers want to see the matching tags, so the
+            # lean summary shape (which drops them) is not enough here
+            projection = {**_COURSE_SUMMARY_PROJECTION, "tags": 1}
         try:
-            courses = list(self.courses_col.find({"tags": {"$in": keywords}}))
+            courses = list(
+                self.courses_col.find(
+                    {"tags": {"$in": keywords}}, projection=projection
+                )
+            )
             return courses
-        except Exception as e:
-            print(f"Error fetching courses with keywords: {e}")
+        except Exception:
+            log.exception("Error fetching courses with keywords")
             return []
 
     def upcoming_assignment_due_date(self, upcoming_week=1):
         """Retrieve assignments with due dates in the next week"""
-        from datetime import datetime, timedelta
-
         try:
-            now = datetime.utcnow()
+            now = datetime.now(timezone.utc)
             future = now + timedelta(weeks=upcoming_week)
             assignments = list(
-                self.assignments_col.find({"dueDate": {"$gte": now, "$lte": future}})
+                self.assignments_col.find(
+                    {"dueDate": {"$gte": now, "$lte": future}},
+                    projection={
+                        "_id": 0,
+                        "assignmentId": 1,
+                        "courseId": 1,
+                        "title": 1,
+                        "dueDate": 1,
+                        "maxScore": 1,
+                    },
+                )
             )
             return assignments
-        except Exception as e:
-            print(f"Error fetching upcoming assignments: {e}")
+        except Exception:
+            log.exception("Error fetching upcoming assignments")
             return []
 
     def enrollment_metrics(self):
@@ -360,8 +859,8 @@ class EdHubDB:
             ]
             result = list(self.enrollments_col.aggregate(pipeline))
             return result
-        except Exception as e:
-            print(f"Error aggregating enrollment metrics: {e}")
+        except Exception:
+            log.exception("Error aggregating enrollment metrics")
             return []
 
     def average_course_rating(self):
@@ -379,8 +878,8 @@ class EdHubDB:
             ]
             result = list(self.courses_col.aggregate(pipeline))
             return result[0] if result else {"averageRating": None, "count": 0}
-        except Exception as e:
-            print(f"Error calculating average course rating: {e}")
+        except Exception:
+            log.exception("Error calculating average course rating")
             return {"averageRating": None, "count": 0}
 
     def group_course_by_category(self):
@@ -405,22 +904,27 @@ class EdHubDB:
                     }
                 },
             ]
-            result = list(self.courses_col.aggregate(pipeline))
+            result = list(self.courses_col.aggregate(pipeline, allowDiskUse=True))
             return result
-        except Exception as e:
-            print(f"Error grouping courses by category: {e}")
+        except Exception:
+            log.exception("Error grouping courses by category")
             return []
 
     # here
-    def average_grade_per_student(self):
-        """Aggregation: Average grade per student"""
+    def student_stats(self):
+        """Aggregation: Per-student grade and engagement stats in one pass
+
+        Single fused pipeline behind average_grade_per_student and
+        student_engagement_metrics, so callers needing both only pay for
+        one group and one lookup into users.
+        """
         try:
             pipeline = [
                 {
                     "$group": {
                         "_id": "$studentId",
                         "averageGrade": {"$avg": "$grade"},
-                        "submissions": {"$sum": 1},
+                        "totalSubmissions": {"$sum": 1},
                     }
                 },
                 {
@@ -440,16 +944,28 @@ class EdHubDB:
                             "$concat": ["$student.firstName", " ", "$student.lastName"]
                         },
                         "averageGrade": 1,
-                        "submissions": 1,
+                        "totalSubmissions": 1,
                     }
                 },
             ]
             result = list(self.submissions_col.aggregate(pipeline))
             return result
-        except Exception as e:
-            print(f"Error calculating average grade per student: {e}")
+        except Exception:
+            log.exception("Error calculating student stats")
             return []
 
+    def average_grade_per_student(self):
+        """Aggregation: Average grade per student"""
+        return [
+            {
+                "studentId": stats["studentId"],
+                "studentName": stats["studentName"],
+                "averageGrade": stats["averageGrade"],
+                "submissions": stats["totalSubmissions"],
+            }
+            for stats in self.student_stats()
+        ]
+
     def course_completion_rate(self):
         """Aggregation: Completion rate by course"""
         try:
@@ -478,8 +994,8 @@ class EdHubDB:
             ]
             result = list(self.enrollments_col.aggregate(pipeline))
             return result
-        except Exception as e:
-            print(f"Error calculating course completion rate: {e}")
+        except Exception:
+            log.exception("Error calculating course completion rate")
             return []
 
     def top_performing_students(self, limit=5):
@@ -518,12 +1034,18 @@ class EdHubDB:
             ]
             result = list(self.submissions_col.aggregate(pipeline))
             return result
-        except Exception as e:
-            print(f"Error fetching top-performing students: {e}")
+        except Exception:
+            log.exception("Error fetching top-performing students")
             return []
 
     def total_student_by_each_instructor(self):
-        """Aggregation: Total students taught by each instructor"""
+        """Aggregation: Total students taught by each instructor
+
+        Distinct students are counted via a two-stage group on
+        (instructor, student) pairs so no group holds an unbounded
+        student set; coursesTaught stays bounded by the instructor's own
+        course count.
+        """
         try:
             pipeline = [
                 {
@@ -537,9 +1059,18 @@ class EdHubDB:
                 {"$unwind": "$course"},
                 {
                     "$group": {
-                        "_id": "$course.instructorId",
-                        "students": {"$addToSet": "$studentId"},
-                        "coursesTaught": {"$addToSet": "$course.courseId"},
+                        "_id": {
+                            "instructorId": "$course.instructorId",
+                            "studentId": "$studentId",
+                        },
+                        "courses": {"$addToSet": "$course.courseId"},
+                    }
+                },
+                {
+                    "$group": {
+                        "_id": "$_id.instructorId",
+                        "totalStudents": {"$sum": 1},
+                        "courseSets": {"$addToSet": "$courses"},
                     }
                 },
                 {
@@ -562,26 +1093,52 @@ class EdHubDB:
                                 "$instructor.lastName",
                             ]
                         },
-                        "totalStudents": {"$size": "$students"},
-                        "coursesTaught": 1,
+                        "totalStudents": 1,
+                        "coursesTaught": {
+                            "$reduce": {
+                                "input": "$courseSets",
+                                "initialValue": [],
+                                "in": {"$setUnion": ["$$value", "$$this"]},
+                            }
+                        },
                     }
                 },
             ]
-            result = list(self.enrollments_col.aggregate(pipeline))
+            result = list(self.enrollments_col.aggregate(pipeline, allowDiskUse=True))
             return result
-        except Exception as e:
-            print(f"Error calculating total students by instructor: {e}")
+        except Exception:
+            log.exception("Error calculating total students by instructor")
+            return []
+
+    def courses_by_instructor(self, instructor_id, skip=0, limit=50):
+        """Paginated list of an instructor's courses (uses instructorId index)"""
+        try:
+            courses = list(
+                self.courses_col.find(
+                    {"instructorId": instructor_id},
+                    projection=_COURSE_SUMMARY_PROJECTION,
+                )
+                .skip(skip)
+                .limit(limit)
+            )
+            return courses
+        except Exception:
+            log.exception("Error fetching courses by instructor")
             return []
 
     def average_course_rating_per_instructor(self):
-        """Aggregation: Average course rating per instructor"""
+        """Aggregation: Average course rating per instructor
+
+        Returns a bounded count of courses per instructor; use
+        courses_by_instructor to page through the actual course list.
+        """
         try:
             pipeline = [
                 {
                     "$group": {
                         "_id": "$instructorId",
                         "averageRating": {"$avg": "$rating"},
-                        "courses": {"$push": "$title"},
+                        "courseCount": {"$sum": 1},
                     }
                 },
                 {
@@ -605,34 +1162,40 @@ class EdHubDB:
                             ]
                         },
                         "averageRating": 1,
-                        "courses": 1,
+                        "courseCount": 1,
                     }
                 },
             ]
-            result = list(self.courses_col.aggregate(pipeline))
+            result = list(self.courses_col.aggregate(pipeline, allowDiskUse=True))
             return result
-        except Exception as e:
-            print(f"Error calculating average course rating per instructor: {e}")
+        except Exception:
+            log.exception("Error calculating average course rating per instructor")
             return []
 
     def revenue_per_instructor(self):
-        """Aggregation: Revenue generated per instructor"""
+        """Aggregation: Revenue generated per instructor
+
+        Driven from the small courses collection so it is the build side
+        of the join and the enrollments.courseId index serves the probe;
+        the $unwind sits directly after the $lookup so the server can use
+        the fused lookup-unwind plan.
+        """
         try:
             pipeline = [
                 {
                     "$lookup": {
-                        "from": "courses",
+                        "from": "enrollments",
                         "localField": "courseId",
                         "foreignField": "courseId",
-                        "as": "course",
+                        "as": "enrollment",
                     }
                 },
-                {"$unwind": "$course"},
+                {"$unwind": "$enrollment"},
                 {
                     "$group": {
-                        "_id": "$course.instructorId",
-                        "revenue": {"$sum": "$course.price"},
-                        "courses": {"$addToSet": "$course.courseId"},
+                        "_id": "$instructorId",
+                        "revenue": {"$sum": "$price"},
+                        "courses": {"$addToSet": "$courseId"},
                     }
                 },
                 {
@@ -660,39 +1223,67 @@ class EdHubDB:
                     }
                 },
             ]
-            result = list(self.enrollments_col.aggregate(pipeline))
+            result = list(self.courses_col.aggregate(pipeline, allowDiskUse=True))
             return result
-        except Exception as e:
-            print(f"Error calculating revenue per instructor: {e}")
+        except Exception:
+            log.exception("Error calculating revenue per instructor")
             return []
 
-    def montly_enrollment_trend(self):
-        """Aggregation: Monthly enrollment trends"""
+    def refresh_enrollment_trends(self):
+        """Re-aggregate enrollments into the enrollment_trends_mv view.
+
+        $merge upserts per (year, month), so refreshing costs one scan of
+        enrollments while every read of the view stays O(#months).
+        """
+        mv = self.db["enrollment_trends_mv"]
+        # $merge requires a unique index on its "on" fields
+        mv.create_index([("year", 1), ("month", 1)], unique=True)
+        pipeline = [
+            {
+                "$group": {
+                    "_id": {
+                        "year": {"$year": "$enrollmentDate"},
+                        "month": {"$month": "$enrollmentDate"},
+                    },
+                    "totalEnrollments": {"$sum": 1},
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "year": "$_id.year",
+                    "month": "$_id.month",
+                    "totalEnrollments": 1,
+                }
+            },
+            {
+                "$merge": {
+                    "into": "enrollment_trends_mv",
+                    "on": ["year", "month"],
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+        self.enrollments_col.aggregate(pipeline)
+
+    def montly_enrollment_trend(self, refresh=False):
+        """Aggregation: Monthly enrollment trends
+
+        Served from the enrollment_trends_mv materialized view; pass
+        refresh=True (or call refresh_enrollment_trends on a schedule) to
+        pick up enrollments added since the last refresh.
+        """
         try:
-            pipeline = [
-                {
-                    "$group": {
-                        "_id": {
-                            "year": {"$year": "$enrollmentDate"},
-                            "month": {"$month": "$enrollmentDate"},
-                        },
-                        "totalEnrollments": {"$sum": 1},
-                    }
-                },
-                {"$sort": {"_id.year": 1, "_id.month": 1}},
-                {
-                    "$project": {
-                        "_id": 0,
-                        "year": "$_id.year",
-                        "month": "$_id.month",
-                        "totalEnrollments": 1,
-                    }
-                },
-            ]
-            result = list(self.enrollments_col.aggregate(pipeline))
+            mv = self.db["enrollment_trends_mv"]
+            if refresh or mv.estimated_document_count() == 0:
+                self.refresh_enrollment_trends()
+            result = list(
+                mv.find({}, {"_id": 0}).sort([("year", 1), ("month", 1)])
+            )
             return result
-        except Exception as e:
-            print(f"Error calculating monthly enrollment trends: {e}")
+        except Exception:
+            log.exception("Error calculating monthly enrollment trends")
             return []
 
     def most_popular_course_categories(self, limit=5):
@@ -706,73 +1297,85 @@ class EdHubDB:
             ]
             result = list(self.courses_col.aggregate(pipeline))
             return result
-        except Exception as e:
-            print(f"Error calculating most popular course categories: {e}")
+        except Exception:
+            log.exception("Error calculating most popular course categories")
             return []
 
     def student_engagement_metrics(self):
         """Aggregation: Student engagement metrics (e.g., submissions per student)"""
-        try:
-            pipeline = [
-                {
-                    "$group": {
-                        "_id": "$studentId",
-                        "totalSubmissions": {"$sum": 1},
-                        "averageGrade": {"$avg": "$grade"},
-                    }
-                },
-                {
-                    "$lookup": {
-                        "from": "users",
-                        "localField": "_id",
-                        "foreignField": "userId",
-                        "as": "student",
-                    }
-                },
-                {"$unwind": "$student"},
-                {
-                    "$project": {
-                        "_id": 0,
-                        "studentId": "$_id",
-                        "studentName": {
-                            "$concat": ["$student.firstName", " ", "$student.lastName"]
-                        },
-                        "totalSubmissions": 1,
-                        "averageGrade": 1,
-                    }
-                },
-            ]
-            result = list(self.submissions_col.aggregate(pipeline))
-            return result
-        except Exception as e:
-            print(f"Error calculating student engagement metrics: {e}")
-            return []
+        return self.student_stats()
 
     def setup_index(self):
-        """Create indexes for efficient queries"""
+        """Create indexes for efficient queries (one command per collection)"""
         try:
-            # User email lookup (unique)
-            self.users_col.create_index("email", unique=True)
-            # Course search by title (text) and category
-            self.courses_col.create_index([("title", "text")])
-            self.courses_col.create_index("category")
+            self.users_col.create_indexes(
+                [
+                    # User email lookup (unique)
+                    IndexModel("email", unique=True),
+                    # Every $lookup joins into users on userId
+                    IndexModel("userId", unique=True),
+                    # Hinted by get_active_students
+                    IndexModel([("isActive", 1), ("role", 1)]),
+                ]
+            )
+            self.courses_col.create_indexes(
+                [
+                    # CRUD updates filter on the business ID
+                    IndexModel("courseId", unique=True),
+                    # Course search by title/description (text) and category
+                    IndexModel([("title", "text"), ("description", "text")]),
+                    # Case-insensitive title prefix search
+                    IndexModel(
+                        [("title", 1)], collation={"locale": "en", "strength": 2}
+                    ),
+                    IndexModel("category"),
+                    # Instructor rollups join/group on instructorId
+                    IndexModel("instructorId"),
+                    # Hinted by courses_by_price
+                    IndexModel("price"),
+                ]
+            )
             # Assignment queries by due date
-            self.assignments_col.create_index("dueDate")
-            # Enrollment queries by student and course
-            self.enrollments_col.create_index("studentId")
-            self.enrollments_col.create_index("courseId")
-            print("Indexes created successfully.")
-        except Exception as e:
-            print(f"Error setting up indexes: {e}")
+            self.assignments_col.create_indexes([IndexModel("dueDate")])
+            # remove_lesson_from_course filters on both IDs
+            self.lessons_col.create_indexes(
+                [IndexModel([("lessonId", 1), ("courseId", 1)])]
+            )
+            self.enrollments_col.create_indexes(
+                [
+                    # Backstop against duplicate counter-allocated IDs
+                    IndexModel("enrollmentId", unique=True),
+                    # Enrollment queries by student and course
+                    IndexModel("studentId"),
+                    IndexModel("courseId"),
+                    # Monthly enrollment trend groups by enrollmentDate
+                    IndexModel("enrollmentDate"),
+                ]
+            )
+            self.submissions_col.create_indexes(
+                [
+                    # Per-student grade aggregations and grade updates
+                    IndexModel([("studentId", 1), ("grade", 1)]),
+                    IndexModel("submissionId", unique=True),
+                ]
+            )
+            log.info("Indexes created successfully.")
+        except Exception:
+            log.exception("Error setting up indexes")
 
     # Part 6
     def load_schemas(self):
-        """Load validation schemas from JSON file"""
+        """Load validation schemas from JSON file (parsed once per instance)"""
+        if self._schemas is not None:
+            return self._schemas
         try:
-            with open(self.schemas_path, "r") as f:
-                schemas = json.load(f)
-            return schemas
+            self._schemas = _load_json(self.schemas_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"Schema file not found: {self.schemas_path}")
-        except json.JSONDecodeError:
+        except ValueError:
             raise ValueError(f"Invalid JSON in schema file: {self.schemas_path}")
+        self._date_paths = {
+            name: self.helper.compile_date_paths(schema["$jsonSchema"])
+            for name, schema in self._schemas.items()
+        }
+        return self._schemas
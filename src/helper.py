@@ -1,8 +1,13 @@
 import random
-import dateutil.parser
+from datetime import datetime
 from faker import Faker
 from bson import ObjectId
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class Helper:
     def __init__(self):
@@ -22,6 +27,20 @@ class Helper:
             "Cloud Computing",
         ]
         self.levels = ["beginner", "intermediate", "advanced"]
+        self._rng = np.random.default_rng() if np is not None else None
+
+    def _choices(self, options, n):
+        """n categorical draws, vectorized in C when numpy is present."""
+        if self._rng is not None:
+            return self._rng.choice(options, size=n).tolist()
+        return random.choices(options, k=n)
+
+    def _sample_rows(self, options, k, n):
+        """n independent k-element samples without replacement."""
+        if self._rng is not None:
+            rows = np.tile(np.asarray(options), (n, 1))
+            return self._rng.permuted(rows, axis=1)[:, :k].tolist()
+        return [random.sample(options, k=k) for _ in range(n)]
 
     # make mock data
     def make_user(self, user_id):
@@ -72,6 +91,110 @@ class Helper:
             "updatedAt": self.faker.date_time_between(start_date="-1y", end_date="now"),
         }
 
+    # bulk variants: sample each field for the whole batch, then zip the
+    # columns into documents, amortizing Faker's provider dispatch
+    def make_users_bulk(self, user_ids):
+        user_ids = list(user_ids)
+        n = len(user_ids)
+        emails = [self.faker.email() for _ in range(n)]
+        first_names = [self.faker.first_name() for _ in range(n)]
+        last_names = [self.faker.last_name() for _ in range(n)]
+        roles = self._choices(self.roles, n)
+        dates_joined = [
+            self.faker.date_time_between(start_date="-2y", end_date="now")
+            for _ in range(n)
+        ]
+        bios = [self.faker.sentence() for _ in range(n)]
+        avatars = [self.faker.image_url() for _ in range(n)]
+        skills = self._sample_rows(self.skills, 3, n)
+        actives = self._choices([True, False], n)
+        return [
+            {
+                "_id": ObjectId(),
+                "userId": user_id,
+                "email": emails[i],
+                "firstName": first_names[i],
+                "lastName": last_names[i],
+                "role": roles[i],
+                "dateJoined": dates_joined[i],
+                "profile": {
+                    "bio": bios[i],
+                    "avatar": avatars[i],
+                    "skills": skills[i],
+                },
+                "is_active": actives[i],
+            }
+            for i, user_id in enumerate(user_ids)
+        ]
+
+    def make_courses_bulk(self, id_pairs):
+        """id_pairs is an iterable of (course_id, instructor_id) tuples."""
+        id_pairs = list(id_pairs)
+        n = len(id_pairs)
+        titles = [self.faker.sentence() for _ in range(n)]
+        descriptions = [" ".join(self.faker.sentences(nb=3)) for _ in range(n)]
+        categories = self._choices(self.skills, n)
+        levels = self._choices(self.levels, n)
+        durations = [self.faker.random_int(min=10, max=99) for _ in range(n)]
+        prices = [self.faker.random_int(min=1000, max=10000) for _ in range(n)]
+        tags = self._sample_rows(self.skills, 2, n)
+        created = [
+            self.faker.date_time_between(start_date="-3y", end_date="-2y")
+            for _ in range(n)
+        ]
+        updated = [
+            self.faker.date_time_between(start_date="-1y", end_date="now")
+            for _ in range(n)
+        ]
+        published = self._choices([True, False], n)
+        return [
+            {
+                "courseId": course_id,
+                "title": titles[i],
+                "description": descriptions[i],
+                "instructorId": instructor_id,
+                "category": categories[i],
+                "level": levels[i],
+                "duration": durations[i],
+                "price": prices[i],
+                "tags": tags[i],
+                "createdAt": created[i],
+                "updatedAt": updated[i],
+                "isPublished": published[i],
+            }
+            for i, (course_id, instructor_id) in enumerate(id_pairs)
+        ]
+
+    def make_lessons_bulk(self, id_pairs):
+        """id_pairs is an iterable of (lesson_id, course_id) tuples."""
+        id_pairs = list(id_pairs)
+        n = len(id_pairs)
+        titles = [self.faker.sentence() for _ in range(n)]
+        contents = [" ".join(self.faker.sentences(nb=5)) for _ in range(n)]
+        orders = [self.faker.random_int(min=0, max=99) for _ in range(n)]
+        created = [
+            self.faker.date_time_between(start_date="-3y", end_date="-2y")
+            for _ in range(n)
+        ]
+        updated = [
+            self.faker.date_time_between(start_date="-1y", end_date="now")
+            for _ in range(n)
+        ]
+        return [
+            {
+                "lessonId": lesson_id,
+                "courseId": course_id,
+                "title": titles[i],
+                "content": contents[i],
+                "order": orders[i],
+                "resources": ["intro.pdf"],
+                "duration": 30,
+                "createdAt": created[i],
+                "updatedAt": updated[i],
+            }
+            for i, (lesson_id, course_id) in enumerate(id_pairs)
+        ]
+
     def get_date_fields(self, schema):
         """Extract all property names with bsonType 'date' from a schema dict."""
         date_fields = set()
@@ -88,29 +211,72 @@ class Helper:
         extract_dates(schema.get("properties", {}))
         return date_fields
 
+    def compile_date_paths(self, schema):
+        """Flatten a schema's date fields into tuples of nested keys."""
+        paths = []
+
+        def walk(properties, prefix=()):
+            for k, v in properties.items():
+                if isinstance(v, dict):
+                    if v.get("bsonType") == "date":
+                        paths.append(prefix + (k,))
+                    if "properties" in v:
+                        walk(v["properties"], prefix + (k,))
+
+        walk(schema.get("properties", {}))
+        return paths
+
+    def convert_dates_by_paths(self, doc, paths):
+        """Convert the date fields at the given key paths in place.
+
+        Indexes straight to each known date field instead of walking
+        every field of the document, so cost scales with the number of
+        date fields rather than the document size.
+        """
+        for path in paths:
+            target = doc
+            for key in path[:-1]:
+                target = target.get(key)
+                if not isinstance(target, dict):
+                    target = None
+                    break
+            if target is None:
+                continue
+            last = path[-1]
+            value = target.get(last)
+            if isinstance(value, str):
+                try:
+                    target[last] = datetime.fromisoformat(
+                        value.replace("Z", "+00:00")
+                    )
+                except ValueError:
+                    pass
+        return doc
+
     def convert_dates_by_schema(self, obj, date_fields, prefix=""):
         """Convert only fields listed in date_fields to datetime."""
+        if not date_fields:
+            return obj
         if isinstance(obj, dict):
             for k, v in obj.items():
                 full_key = prefix + k
                 if full_key in date_fields and isinstance(v, str):
                     try:
-                        obj[k] = dateutil.parser.isoparse(v)
+                        # C-implemented and much faster than dateutil;
+                        # the replace keeps trailing-Z support on 3.8+
+                        obj[k] = datetime.fromisoformat(v.replace("Z", "+00:00"))
                     except Exception:
                         pass
                 elif isinstance(v, dict):
-                    obj[k] = self.convert_dates_by_schema(
+                    # Recursion mutates in place; no rebinding needed
+                    self.convert_dates_by_schema(
                         v, date_fields, prefix=full_key + "."
                     )
                 elif isinstance(v, list):
-                    obj[k] = [
-                        (
+                    # Recurse into dict elements without rebuilding the list
+                    for item in v:
+                        if isinstance(item, dict):
                             self.convert_dates_by_schema(
                                 item, date_fields, prefix=full_key + "."
                             )
-                            if isinstance(item, dict)
-                            else item
-                        )
-                        for item in v
-                    ]
         return obj